@@ -1,10 +1,19 @@
 # app.py
 import os
+import re
+import math
+import time
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import PlainTextResponse
 
-from database import SessionLocal, User, MessageLog
+from database import SessionLocal, User, MessageLog, init_db
 from whatsapp import send_message
+from rate_limit import limiter, command_cost
+from fixture_index import get_fixture_index, build_team_message, build_next_message
+import reminders
 from football_api import (
     fetch_events_today,
     build_live_message,
@@ -14,11 +23,53 @@ from football_api import (
     LEAGUE_MAP,
     DEFAULT_LEAGUES,
     debug_league_names,
+    warm_up,
 )
 
-import scheduler  # starts scheduler on import
+import scheduler  # no side effects on import; started from lifespan
+
+# Process start -> ready above this budget is logged so cold-start regressions are visible.
+# Measured ~0.9 s (FastAPI ~0.5 s + SQLAlchemy ~0.4 s of imports); see bench_startup.py.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+logger = logging.getLogger(__name__)
+
+
+def _process_age_ms():
+    """
+    Milliseconds since this process started (Linux /proc).
+    Elsewhere, the CPU time used so far: startup is almost all imports, which
+    are CPU-bound, so this is a close lower bound without timing code above them.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000
+    except Exception:
+        return time.process_time() * 1000
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    warm_up()
+    sched = scheduler.start_scheduler() if scheduler.ENABLE_SCHEDULER else None
+
+    startup_ms = _process_age_ms()
+    if startup_ms > STARTUP_BUDGET_MS:
+        logger.warning("Startup took %.0f ms (budget %.0f ms)", startup_ms, STARTUP_BUDGET_MS)
+
+    try:
+        yield
+    finally:
+        if sched:
+            sched.shutdown(wait=False)
+            reminders.queue.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 VERIFY_TOKEN = os.getenv("VERIFY_TOKEN", "live_ball")
 
 
@@ -63,10 +114,6 @@ async def webhook(req: Request):
     except Exception:
         return {"status": "could not parse message"}
 
-    if not text:
-        send_message(phone, "I can only read text right now. Type menu.")
-        return {"status": "ok"}
-
     db = SessionLocal()
     try:
         # Dedupe Meta retries
@@ -76,6 +123,18 @@ async def webhook(req: Request):
             db.add(MessageLog(msg_id=msg_id))
             db.commit()
 
+        # Rate limit (after dedupe, so retries don't spend tokens) before any
+        # other DB work, upstream fetch, or outbound send
+        allowed, notify = limiter.allow(phone, command_cost(text))
+        if not allowed:
+            if notify:
+                send_message(phone, "Too many requests. Please wait a minute and try again.")
+            return {"status": "rate_limited"}
+
+        if not text:
+            send_message(phone, "I can only read text right now. Type menu.")
+            return {"status": "ok"}
+
         user = db.get(User, phone)
         if not user:
             user = User(phone=phone, auto_updates=False, leagues="")
@@ -85,7 +144,7 @@ async def webhook(req: Request):
         selected = parse_user_leagues(user.leagues)
 
         if text == "menu":
-            send_message(phone, menu(user.auto_updates, selected))
+            send_message(phone, menu(user.auto_updates, selected, user.reminders))
 
         elif text == "leagues":
             send_message(phone, available_leagues_text())
@@ -118,6 +177,17 @@ async def webhook(req: Request):
             events = fetch_events_today()
             send_message(phone, build_results_message(events, selected_codes=selected))
 
+        elif text.startswith("team "):
+            query = text.replace("team ", "", 1).strip()
+            send_message(phone, build_team_message(get_fixture_index(), query))
+
+        elif text == "next" or text.startswith("next "):
+            hours = parse_hours(text.replace("next", "", 1).strip())
+            if hours is None:
+                send_message(phone, "Usage: next or next 6 (hours ahead, up to 24). For a team, type team <name>.")
+            else:
+                send_message(phone, build_next_message(get_fixture_index(), hours, selected_codes=selected))
+
         elif text == "debug leagues":
             events = fetch_events_today()
             send_message(phone, debug_league_names(events))
@@ -132,6 +202,16 @@ async def webhook(req: Request):
             db.commit()
             send_message(phone, "Auto updates disabled.")
 
+        elif text in ("remind on", "remindon", "remind-on"):
+            user.reminders = True
+            db.commit()
+            send_message(phone, f"Kickoff reminders enabled ({reminders.REMINDER_LEAD_MIN} min before).")
+
+        elif text in ("remind off", "remindoff", "remind-off"):
+            user.reminders = False
+            db.commit()
+            send_message(phone, "Kickoff reminders disabled.")
+
         else:
             send_message(phone, "Type menu to see commands.")
 
@@ -149,6 +229,25 @@ def parse_user_leagues(leagues_str: str):
     return cleaned if cleaned else DEFAULT_LEAGUES
 
 
+_HOURS_ARG = re.compile(r"^(\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hour|hours)?$")
+
+
+def parse_hours(arg: str, default: float = 3, max_hours: float = 24):
+    """
+    "" -> default, "6" / "6h" / "6 hours" -> 6.0 (clamped). None if `arg` isn't a number of hours.
+    """
+    arg = arg.strip()
+    if not arg:
+        return default
+    m = _HOURS_ARG.match(arg)
+    if not m:
+        return None
+    hours = float(m.group(1))
+    if not math.isfinite(hours):
+        return None
+    return min(max(hours, 0.5), max_hours)
+
+
 def add_league(user: User, code: str, db):
     code = code.lower()
     if code not in LEAGUE_MAP:
@@ -176,19 +275,24 @@ def remove_league(user: User, code: str, db):
     return f"Removed {code}."
 
 
-def menu(auto_enabled: bool, selected_codes) -> str:
+def menu(auto_enabled: bool, selected_codes, reminders_enabled: bool = False) -> str:
     auto_status = "ON" if auto_enabled else "OFF"
+    remind_status = "ON" if reminders_enabled else "OFF"
     leagues_status = ", ".join(selected_codes)
 
     return (
         "Soccer Bot\n\n"
         f"Auto updates: {auto_status}\n"
+        f"Kickoff reminders: {remind_status}\n"
         f"Leagues: {leagues_status}\n\n"
         "Commands:\n"
         "• live (or scores) — live matches now\n"
         "• fixtures (or today) — today’s fixtures\n"
         "• results — today’s finished games\n"
+        "• next (or next 6) — kickoffs in the next few hours\n"
+        "• team <name> — next game for a team\n"
         "• auto on / auto off\n"
+        "• remind on / remind off — alert before kickoff\n"
         "• leagues — list options\n"
         "• add <code> — subscribe\n"
         "• remove <code> — unsubscribe\n"
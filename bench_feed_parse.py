@@ -0,0 +1,184 @@
+# bench_feed_parse.py
+"""
+Compares the old full r.json() parse of the events feed against the streaming,
+field-projected parse used by fetch_events_today().
+
+    python bench_feed_parse.py                        # synthetic feed, in memory
+    python bench_feed_parse.py eventsday.json         # raw saved response body
+    python bench_feed_parse.py --serve --mbps 50      # end to end over local HTTP
+
+In memory only measures parsing. --serve measures what fetch_events_today()
+actually pays (download + parse), with the body served at a capped bandwidth.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from football_api import _iter_events_stream, FEED_CHUNK_SIZE
+
+# requests' own chunk size when building r.content
+_REQUESTS_CHUNK = 10 * 1024
+
+# Roughly the shape of a TheSportsDB eventsday.php event
+_FILLER_FIELDS = {
+    "strEvent": "Home FC vs Away FC",
+    "strEventAlternate": "Away FC @ Home FC",
+    "strFilename": "English Premier League 2026-10-18 Home FC vs Away FC",
+    "strSport": "Soccer",
+    "idLeague": "4328",
+    "strSeason": "2026-2027",
+    "strDescriptionEN": "Matchday preview " * 20,
+    "intRound": "9",
+    "intSpectators": None,
+    "strOfficial": "",
+    "strTimestampLocal": None,
+    "dateEventLocal": "2026-10-18",
+    "strTimeLocal": "15:00:00",
+    "strGroup": "",
+    "idHomeTeam": "133604",
+    "idAwayTeam": "133612",
+    "strResult": "",
+    "idVenue": "15528",
+    "strVenue": "Home Stadium",
+    "strCountry": "England",
+    "strCity": "",
+    "strPoster": "https://www.thesportsdb.com/images/media/event/poster/abc.jpg",
+    "strSquare": "https://www.thesportsdb.com/images/media/event/square/abc.jpg",
+    "strFanart": None,
+    "strThumb": "https://www.thesportsdb.com/images/media/event/thumb/abc.jpg",
+    "strBanner": "https://www.thesportsdb.com/images/media/event/banner/abc.jpg",
+    "strMap": None,
+    "strTweet1": "",
+    "strVideo": "https://www.youtube.com/watch?v=abcdefghijk",
+    "strPostponed": "no",
+    "strLocked": "unlocked",
+}
+
+
+def _synthetic_body(n: int = 3000) -> bytes:
+    events = []
+    for i in range(n):
+        e = dict(_FILLER_FIELDS)
+        e.update({
+            "idEvent": str(2000000 + i),
+            "strLeague": f"League {i % 150}",
+            "strHomeTeam": f"Home {i}",
+            "strAwayTeam": f"Away {i}",
+            "intHomeScore": str(i % 4),
+            "intAwayScore": str(i % 3),
+            "strStatus": "Match Finished" if i % 2 else "Not Started",
+            "strTimestamp": "2026-10-18T15:00:00",
+            "dateEvent": "2026-10-18",
+            "strTime": "15:00:00",
+        })
+        events.append(e)
+    return json.dumps({"events": events}).encode("utf-8")
+
+
+def _chunks(body: bytes):
+    for i in range(0, len(body), FEED_CHUNK_SIZE):
+        yield body[i:i + FEED_CHUNK_SIZE]
+
+
+def _full_parse(body: bytes):
+    # What r.json() does: join r.content from chunks, decode, then parse it all
+    content = b"".join(body[i:i + _REQUESTS_CHUNK] for i in range(0, len(body), _REQUESTS_CHUNK))
+    return (json.loads(content.decode("utf-8")) or {}).get("events") or []
+
+
+def _stream_parse(body: bytes):
+    return list(_iter_events_stream(_chunks(body)))
+
+
+def _measure(fn, arg, repeat: int = 5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+
+    tracemalloc.start()
+    result = fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(result)
+
+
+def _serve(body: bytes, mbps: float):
+    """
+    Serves `body` on localhost, paced to roughly `mbps` megabits per second.
+    """
+    send_chunk = 16 * 1024
+    pause = send_chunk * 8 / (mbps * 1_000_000) if mbps > 0 else 0
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for i in range(0, len(body), send_chunk):
+                self.wfile.write(body[i:i + send_chunk])
+                if pause:
+                    time.sleep(pause)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/eventsday.php"
+
+
+def _fetch_full(url):
+    r = requests.get(url, timeout=20)
+    r.raise_for_status()
+    return (r.json() or {}).get("events") or []
+
+
+def _fetch_stream(url):
+    with requests.get(url, timeout=20, stream=True) as r:
+        r.raise_for_status()
+        return list(_iter_events_stream(r.iter_content(chunk_size=FEED_CHUNK_SIZE)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark events feed parsing.")
+    parser.add_argument("path", nargs="?", help="saved eventsday.php body (default: synthetic)")
+    parser.add_argument("--serve", action="store_true", help="fetch over local HTTP instead of parsing in memory")
+    parser.add_argument("--mbps", type=float, default=50.0, help="served bandwidth for --serve (0 = unthrottled)")
+    args = parser.parse_args()
+
+    if args.path:
+        with open(args.path, "rb") as f:
+            body = f.read()
+    else:
+        body = _synthetic_body()
+
+    print(f"body: {len(body) / 1024:.0f} KiB")
+
+    if not args.serve:
+        for name, fn in (("r.json()", _full_parse), ("streaming", _stream_parse)):
+            secs, peak, count = _measure(fn, body)
+            print(f"{name:10s} events={count} time={secs * 1000:.1f} ms peak={peak / 1024:.0f} KiB")
+        return
+
+    server, url = _serve(body, args.mbps)
+    try:
+        print(f"served at {args.mbps:g} Mbit/s")
+        for name, fn in (("r.json()", _fetch_full), ("streaming", _fetch_stream)):
+            secs, peak, count = _measure(fn, url, repeat=3)
+            print(f"{name:10s} events={count} fetch+parse={secs * 1000:.1f} ms peak={peak / 1024:.0f} KiB")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
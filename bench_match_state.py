@@ -0,0 +1,128 @@
+# bench_match_state.py
+"""
+Compares the old string-keyed match_state table and per-row tick writes
+against the compact (phone, event_id) WITHOUT ROWID table used now.
+
+    python bench_match_state.py [users] [events]
+"""
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+from datetime import datetime
+
+OLD_DDL = (
+    "CREATE TABLE match_state (key VARCHAR NOT NULL, phone VARCHAR, event_id VARCHAR, "
+    "home VARCHAR, away VARCHAR, home_score INTEGER, away_score INTEGER, status VARCHAR, "
+    "updated_at DATETIME, PRIMARY KEY (key))",
+    "CREATE INDEX ix_match_state_key ON match_state (key)",
+    "CREATE INDEX ix_match_state_phone ON match_state (phone)",
+    "CREATE INDEX ix_match_state_event_id ON match_state (event_id)",
+)
+
+NEW_DDL = (
+    "CREATE TABLE match_state (phone VARCHAR NOT NULL, event_id INTEGER NOT NULL, "
+    "home_score SMALLINT, away_score SMALLINT, phase SMALLINT, updated_at INTEGER, "
+    "PRIMARY KEY (phone, event_id)) WITHOUT ROWID",
+)
+
+# Share of tracked matches whose score/phase changes on a given tick
+CHANGE_EVERY = 20
+
+
+def _phones(users):
+    return [f"4477009{i:05d}" for i in range(users)]
+
+
+def _event_ids(events):
+    return [2000000 + i for i in range(events)]
+
+
+def _bench_old(path, users, events, ticks):
+    conn = sqlite3.connect(path)
+    for ddl in OLD_DDL:
+        conn.execute(ddl)
+    now = datetime.utcnow().isoformat(" ")
+    conn.executemany(
+        "INSERT INTO match_state VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (f"{p}:{e}", p, str(e), f"Home Team {e}", f"Away Team {e}", 0, 0, "2H", now)
+            for p in _phones(users) for e in _event_ids(events)
+        ],
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    size = os.path.getsize(path)
+
+    t0 = time.perf_counter()
+    for tick in range(ticks):
+        conn.execute("DELETE FROM match_state WHERE updated_at < ?", ("2000-01-01",))
+        conn.commit()
+        for p in _phones(users):
+            for e in _event_ids(events):
+                key = f"{p}:{e}"
+                conn.execute("SELECT * FROM match_state WHERE key = ?", (key,)).fetchone()
+                hs = tick + 1 if e % CHANGE_EVERY == 0 else 0
+                conn.execute(
+                    "UPDATE match_state SET home = ?, away = ?, home_score = ?, away_score = ?, "
+                    "status = ?, updated_at = ? WHERE key = ?",
+                    (f"Home Team {e}", f"Away Team {e}", hs, 0, "2H", now, key),
+                )
+                conn.commit()
+    elapsed = (time.perf_counter() - t0) / ticks
+    conn.close()
+    return size, elapsed
+
+
+def _bench_new(path, users, events, ticks):
+    conn = sqlite3.connect(path)
+    for ddl in NEW_DDL:
+        conn.execute(ddl)
+    now = int(time.time())
+    conn.executemany(
+        "INSERT INTO match_state VALUES (?, ?, ?, ?, ?, ?)",
+        [(p, e, 0, 0, 1, now) for p in _phones(users) for e in _event_ids(events)],
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    size = os.path.getsize(path)
+
+    t0 = time.perf_counter()
+    for tick in range(ticks):
+        for p in _phones(users):
+            states = {
+                r[0]: r for r in conn.execute(
+                    "SELECT event_id, home_score, away_score, phase FROM match_state WHERE phone = ?", (p,)
+                )
+            }
+            for e in _event_ids(events):
+                hs = tick + 1 if e % CHANGE_EVERY == 0 else 0
+                if states[e][1] != hs:
+                    conn.execute(
+                        "UPDATE match_state SET home_score = ?, updated_at = ? WHERE phone = ? AND event_id = ?",
+                        (hs, now, p, e),
+                    )
+            conn.commit()
+    elapsed = (time.perf_counter() - t0) / ticks
+    conn.close()
+    return size, elapsed
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    ticks = 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_size, old_tick = _bench_old(os.path.join(tmp, "old.db"), users, events, ticks)
+        new_size, new_tick = _bench_new(os.path.join(tmp, "new.db"), users, events, ticks)
+
+    print(f"rows: {users * events} ({users} users x {events} matches)")
+    print(f"old: db={old_size / 1024:.0f} KiB tick={old_tick * 1000:.1f} ms")
+    print(f"new: db={new_size / 1024:.0f} KiB tick={new_tick * 1000:.1f} ms")
+    print(f"size -{(1 - new_size / old_size) * 100:.0f}%, tick x{old_tick / new_tick:.1f} faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_startup.py
+"""
+Measures cold start from process start: interpreter boot, `import app`, then the
+lifespan startup (schema on a temporary SQLite file, warm-up; scheduler disabled).
+Exits 1 if over budget.
+
+    python bench_startup.py               # budget from STARTUP_BUDGET_MS (default 1500)
+    python bench_startup.py --importtime  # also list the slowest imports (-X importtime)
+
+Measured on a dev container (Python 3.11): ~0.9 s total, almost all of it importing
+fastapi (~0.5 s) and sqlalchemy (~0.4 s); lifespan ~5 ms.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+_PROBE = r"""
+import time, asyncio
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+
+async def _run():
+    async with app.lifespan(app.app):
+        pass
+
+asyncio.run(_run())
+t2 = time.perf_counter()
+print(f"{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f}")
+"""
+
+
+def _slowest_imports(stderr: str, top: int, max_depth: int = 1):
+    """
+    Parses -X importtime output; keeps modules at most `max_depth` levels below
+    a top-level import (e.g. what `app` pulls in directly).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        if depth <= max_depth:
+            rows.append((int(cumulative), raw_name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start time.")
+    parser.add_argument("--importtime", action="store_true", help="show the slowest top-level imports")
+    args = parser.parse_args()
+
+    budget_ms = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+    cmd = [sys.executable]
+    if args.importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE]
+
+    # Throwaway DB, so the run neither touches nor depends on the real one
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            ENABLE_SCHEDULER="0",
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+        )
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            cmd,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total_ms = (time.perf_counter() - t0) * 1000
+
+    out = proc.stdout.split()
+    import_ms, lifespan_ms = float(out[-2]), float(out[-1])
+
+    print(f"import app: {import_ms:.1f} ms")
+    print(f"lifespan:   {lifespan_ms:.1f} ms")
+    print(f"process:    {total_ms:.1f} ms (start -> exit; budget {budget_ms:.0f} ms)")
+
+    if args.importtime:
+        print("\nslowest imports (cumulative):")
+        for us, name in _slowest_imports(proc.stderr, 8):
+            print(f"  {us / 1000:7.1f} ms  {name}")
+
+    if total_ms > budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 # database.py
+import os
 from datetime import datetime
-from sqlalchemy import create_engine, Column, String, Boolean, DateTime, Integer, text
+from datetime import timezone
+from sqlalchemy import create_engine, Column, String, Boolean, DateTime, Integer, SmallInteger, MetaData, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-DATABASE_URL = "sqlite:///./users.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./users.db")
 
 engine = create_engine(
     DATABASE_URL,
@@ -20,6 +22,7 @@ class User(Base):
     phone = Column(String, primary_key=True, index=True)
     auto_updates = Column(Boolean, default=False)
     leagues = Column(String, default="")  # comma-separated codes
+    reminders = Column(Boolean, default=False)  # pre-kickoff reminders
 
 
 class MessageLog(Base):
@@ -32,27 +35,88 @@ class MessageLog(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+# MatchState.phase values
+PHASE_OTHER = 0
+PHASE_LIVE = 1
+PHASE_FINISHED = 2
+
+
 class MatchState(Base):
     """
     Stores last known state of a match PER USER so we can detect:
     - kickoff (first time seen live)
     - goals (score changes)
-    - full time (status becomes finished)
+    - full time (phase becomes finished)
+
+    Keyed by (phone, event_id) in a WITHOUT ROWID table, so the primary key is
+    the only index. Team names/status text come from the feed, not stored here.
     """
     __tablename__ = "match_state"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    phone = Column(String, primary_key=True)
+    event_id = Column(Integer, primary_key=True)
 
-    key = Column(String, primary_key=True, index=True)  # f"{phone}:{event_id}"
-    phone = Column(String, index=True)
-    event_id = Column(String, index=True)
+    home_score = Column(SmallInteger, nullable=True)
+    away_score = Column(SmallInteger, nullable=True)
 
-    home = Column(String, default="")
-    away = Column(String, default="")
+    phase = Column(SmallInteger, default=PHASE_OTHER)
+    updated_at = Column(Integer, default=0)  # unix seconds
 
-    home_score = Column(Integer, nullable=True)
-    away_score = Column(Integer, nullable=True)
 
-    status = Column(String, default="")
-    updated_at = Column(DateTime, default=datetime.utcnow)
+def _old_updated_at(value) -> int:
+    # Old rows stored naive UTC datetimes as text
+    try:
+        return int(datetime.fromisoformat(str(value)).replace(tzinfo=timezone.utc).timestamp())
+    except Exception:
+        return 0
+
+
+def _migrate_match_state(conn):
+    """
+    Copies the old string-keyed match_state (key, phone, event_id TEXT, status TEXT, ...)
+    into the (phone, event_id) table, then swaps the tables. Phase comes from the old
+    status text with the same keywords the scheduler uses, so in-progress matches
+    don't announce kickoff again after the upgrade.
+    """
+    from football_api import _is_live, _is_finished
+
+    new_table = MatchState.__table__.to_metadata(MetaData(), name="match_state_new")
+    conn.execute(text("DROP TABLE IF EXISTS match_state_new"))  # left over from an interrupted run
+    new_table.create(bind=conn)
+
+    rows = []
+    old = conn.execute(text(
+        "SELECT phone, event_id, home_score, away_score, status, updated_at FROM match_state"
+    ))
+    for phone, event_id, home_score, away_score, status, updated_at in old:
+        event_id = str(event_id or "").strip()
+        if not phone or not event_id.isdigit():
+            continue
+        e = {"strStatus": status, "intHomeScore": home_score, "intAwayScore": away_score}
+        if _is_finished(e):
+            phase = PHASE_FINISHED
+        elif _is_live(e):
+            phase = PHASE_LIVE
+        else:
+            phase = PHASE_OTHER
+        rows.append({
+            "phone": phone,
+            "event_id": int(event_id),
+            "home_score": home_score,
+            "away_score": away_score,
+            "phase": phase,
+            "updated_at": _old_updated_at(updated_at),
+        })
+
+    if rows:
+        # OR IGNORE: ids differing only by leading zeros map to the same integer
+        conn.execute(new_table.insert().prefix_with("OR IGNORE"), rows)
+    conn.commit()
+
+    conn.execute(text("DROP TABLE match_state"))
+    conn.execute(text("ALTER TABLE match_state_new RENAME TO match_state"))
+    conn.commit()
 
 
 def _ensure_schema():
@@ -65,9 +129,29 @@ def _ensure_schema():
             existing_cols = {r[1] for r in rows}
             if "leagues" not in existing_cols:
                 conn.execute(text("ALTER TABLE users ADD COLUMN leagues VARCHAR DEFAULT ''"))
+            if "reminders" not in existing_cols:
+                conn.execute(text("ALTER TABLE users ADD COLUMN reminders BOOLEAN DEFAULT 0"))
         except Exception:
             pass
 
+        try:
+            rows = conn.execute(text("PRAGMA table_info(match_state);")).fetchall()
+            if "key" in {r[1] for r in rows}:
+                _migrate_match_state(conn)
+        except Exception:
+            conn.rollback()
+
+
+_db_ready = False
 
-_ensure_schema()
-Base.metadata.create_all(bind=engine)
+
+def init_db():
+    """
+    Creates/migrates tables. Called once from the app lifespan (not on import).
+    """
+    global _db_ready
+    if _db_ready:
+        return
+    _ensure_schema()
+    Base.metadata.create_all(bind=engine)
+    _db_ready = True
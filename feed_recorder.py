@@ -0,0 +1,272 @@
+# feed_recorder.py
+"""
+Records fetch_events_today() snapshots during real matchdays and replays them
+through scheduler.send_auto_updates() so the alert path can be load tested offline.
+
+Recording:
+    FEED_RECORD_DIR=./recordings  (one gzip JSON-lines file per UTC day)
+    FEED_RECORD_INTERVAL_SEC=20   (own scheduler job, finer than the 2-minute alert
+                                   tick, so a replay sees when changes really happened)
+
+Replay:
+    python feed_recorder.py replay recordings/events-2026-10-18.jsonl.gz --speed 120 --users 50
+"""
+import os
+import gzip
+import zlib
+import json
+import time
+import argparse
+import tempfile
+import threading
+from bisect import bisect_right
+from datetime import datetime, timezone
+
+from football_api import fetch_events_today
+
+RECORD_DIR = os.getenv("FEED_RECORD_DIR", "")
+FEED_RECORD_INTERVAL_SEC = int(os.getenv("FEED_RECORD_INTERVAL_SEC", "20"))
+
+# Matches the interval used in scheduler.start_scheduler()
+DEFAULT_TICK_SECONDS = 120
+
+_record_lock = threading.Lock()
+
+
+def _recording_path(day: str) -> str:
+    return os.path.join(RECORD_DIR, f"events-{day}.jsonl.gz")
+
+
+def record_snapshot(events) -> None:
+    """
+    Appends one timestamped snapshot to today's recording (no-op unless FEED_RECORD_DIR is set).
+    Only called from the record_feed job, never from request handlers.
+    Each write is its own gzip member; a member cut short by a crash is dropped on load.
+    """
+    if not RECORD_DIR:
+        return
+
+    now = datetime.now(timezone.utc)
+    line = json.dumps(
+        {"ts": now.timestamp(), "events": events},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+    try:
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        with _record_lock:
+            with gzip.open(_recording_path(now.strftime("%Y-%m-%d")), "at", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except Exception:
+        # Never break the feed because recording failed
+        pass
+
+
+def record_feed() -> None:
+    """
+    Scheduler job: fetch and record one snapshot. Runs independently of
+    send_auto_updates so the recording isn't aligned with the alert tick.
+    """
+    if not RECORD_DIR:
+        return
+    try:
+        events = fetch_events_today()
+    except Exception:
+        return
+    record_snapshot(events)
+
+
+def load_recording(path: str):
+    """
+    Returns [(ts, events), ...] sorted by timestamp.
+    A truncated/corrupt tail (e.g. the process died mid-write) keeps what was read before it.
+    """
+    snapshots = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except Exception:
+                    continue
+                snapshots.append((float(row["ts"]), row.get("events") or []))
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            pass
+    snapshots.sort(key=lambda s: s[0])
+    return snapshots
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def replay(path: str, speed: float = 60.0, tick_seconds: int = DEFAULT_TICK_SECONDS, users: int = 1) -> dict:
+    """
+    Drives send_auto_updates() over a recording, one tick every `tick_seconds` of feed time.
+    Each tick sees the latest snapshot recorded at or before the tick time.
+
+    speed: feed seconds per wall second (0 = don't sleep between ticks).
+
+    Alert latency = tick time - feed time of the transition that caused the alert
+    (went live, score changed, finished) for that event.
+    """
+    snapshots = load_recording(path)
+    if not snapshots:
+        raise ValueError(f"No snapshots in {path}")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import scheduler
+    from database import Base, User
+    from football_api import _fmt_live_line, _fmt_result_line, _is_live, _is_finished
+
+    # Dedicated throwaway DB: never the app's engine, whatever was imported before
+    tmp_dir = tempfile.mkdtemp(prefix="replay-")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(tmp_dir, 'replay.db')}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    ReplaySession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = ReplaySession()
+    try:
+        for i in range(users):
+            db.add(User(phone=f"replay-{i}", auto_updates=True, leagues=""))
+        db.commit()
+    finally:
+        db.close()
+
+    # (event_id, alert kind) -> feed times of the transitions that warrant that alert
+    transitions = {}
+    prev = {}
+    for ts, events in snapshots:
+        for e in events:
+            eid = str(e.get("idEvent") or "").strip()
+            if not eid:
+                continue
+            live, finished = _is_live(e), _is_finished(e)
+            score = (e.get("intHomeScore"), e.get("intAwayScore"))
+            was = prev.get(eid)
+
+            if finished and not (was and was[1]):
+                transitions.setdefault((eid, "FULL TIME"), []).append(ts)
+            elif live and not (was and was[0]):
+                transitions.setdefault((eid, "KICKOFF"), []).append(ts)
+            elif live and was and None not in score and score != was[2]:
+                transitions.setdefault((eid, "GOAL"), []).append(ts)
+
+            prev[eid] = (live, finished, score)
+
+    def _line_maps(events):
+        # Alert body -> event id, for the snapshot a tick sees
+        return {
+            "live": {_fmt_live_line(e): str(e.get("idEvent") or "").strip() for e in events},
+            "result": {_fmt_result_line(e): str(e.get("idEvent") or "").strip() for e in events},
+        }
+
+    current = {"events": [], "tick_ts": 0.0, "lines": None}
+    alerts = []
+
+    def _fake_fetch():
+        return current["events"]
+
+    def _fake_send(to_phone, text):
+        kind, _, body = text.partition("\n")
+        eid = current["lines"]["result" if kind == "FULL TIME" else "live"].get(body)
+        times = transitions.get((eid, kind), [])
+        i = bisect_right(times, current["tick_ts"])
+        latency = current["tick_ts"] - times[i - 1] if i else None
+        alerts.append((to_phone, kind, latency))
+
+    patches = {
+        "SessionLocal": ReplaySession,
+        "fetch_events_today": _fake_fetch,
+        "send_message": _fake_send,
+    }
+    saved = {name: getattr(scheduler, name) for name in patches}
+
+    tick_ms = []
+    start_ts = snapshots[0][0]
+    end_ts = snapshots[-1][0]
+    idx = 0
+    lines_idx = None
+    tick_ts = start_ts
+
+    try:
+        for name, value in patches.items():
+            setattr(scheduler, name, value)
+
+        while tick_ts <= end_ts:
+            while idx + 1 < len(snapshots) and snapshots[idx + 1][0] <= tick_ts:
+                idx += 1
+            current["events"] = snapshots[idx][1]
+            current["tick_ts"] = tick_ts
+            if lines_idx != idx:
+                # Bookkeeping for latency attribution, kept out of the timed tick
+                current["lines"] = _line_maps(current["events"])
+                lines_idx = idx
+
+            t0 = time.perf_counter()
+            scheduler.send_auto_updates()
+            tick_ms.append((time.perf_counter() - t0) * 1000.0)
+
+            if speed > 0:
+                time.sleep(tick_seconds / speed)
+            tick_ts += tick_seconds
+    finally:
+        for name, value in saved.items():
+            setattr(scheduler, name, value)
+        engine.dispose()
+
+    latencies = [a[2] for a in alerts if a[2] is not None]
+    by_kind = {}
+    for _, kind, _ in alerts:
+        by_kind[kind] = by_kind.get(kind, 0) + 1
+
+    return {
+        "snapshots": len(snapshots),
+        "ticks": len(tick_ms),
+        "users": users,
+        "tick_ms_mean": sum(tick_ms) / len(tick_ms) if tick_ms else 0.0,
+        "tick_ms_p50": _percentile(tick_ms, 50),
+        "tick_ms_p95": _percentile(tick_ms, 95),
+        "tick_ms_max": max(tick_ms) if tick_ms else 0.0,
+        "alerts": len(alerts),
+        "alerts_by_kind": by_kind,
+        "latency_s_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "latency_s_max": max(latencies) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay the events feed.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    rp = sub.add_parser("replay", help="replay a recording through send_auto_updates")
+    rp.add_argument("path")
+    rp.add_argument("--speed", type=float, default=60.0, help="feed seconds per wall second (0 = no sleep)")
+    rp.add_argument("--interval", type=int, default=DEFAULT_TICK_SECONDS, help="tick interval in feed seconds")
+    rp.add_argument("--users", type=int, default=1, help="simulated auto-update subscribers")
+
+    args = parser.parse_args()
+
+    if args.cmd == "replay":
+        stats = replay(args.path, speed=args.speed, tick_seconds=args.interval, users=args.users)
+        for k, v in stats.items():
+            if isinstance(v, float):
+                v = f"{v:.3f}"
+            print(f"{k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
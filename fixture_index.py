@@ -0,0 +1,184 @@
+# fixture_index.py
+"""
+Fixture index for `team <name>` and `next` queries.
+
+Built from today's and tomorrow's UTC feeds, so windows up to 24 hours don't
+stop at 00:00 UTC (and refreshed every FIXTURE_INDEX_TTL_MIN):
+- entries sorted by kickoff time, so time windows are two bisects
+- normalized team-name prefix map (full name and each word), so
+  "arsenal", "man" or "united" resolve with a dict lookup
+- kickoff time string and league codes precomputed per entry
+"""
+import os
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from football_api import (
+    fetch_events_today,
+    fetch_events_for_day,
+    DEFAULT_LEAGUES,
+    _kickoff_dt_utc,
+    _format_kickoff_time,
+    _is_scheduled,
+    IGNORED_STATUSES,
+    _league_keywords_norm,
+    _norm_txt,
+    _group,
+)
+
+FIXTURE_INDEX_TTL_MIN = float(os.getenv("FIXTURE_INDEX_TTL_MIN", "60"))
+
+MIN_PREFIX = 3
+MAX_PREFIX = 20
+
+
+def _prefix_keys(name_norm: str):
+    keys = set()
+    if not name_norm:
+        return keys
+    keys.add(name_norm)
+    for word in {name_norm, *name_norm.split()}:
+        for n in range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1):
+            keys.add(word[:n])
+    return keys
+
+
+def _is_called_off(e) -> bool:
+    status = _norm_txt(e.get("strStatus"))
+    return any(k in status for k in IGNORED_STATUSES)
+
+
+def _league_codes(league_norm: str):
+    return frozenset(
+        code for code, kws in _league_keywords_norm().items()
+        if league_norm and any(kw in league_norm for kw in kws)
+    )
+
+
+class FixtureIndex:
+    def __init__(self, events, day: str):
+        self.day = day
+        self.built_at = time.monotonic()
+
+        entries = []
+        codes_by_league = {}
+        for e in events:
+            dt = _kickoff_dt_utc(e)
+            if not dt:
+                continue
+            home = e.get("strHomeTeam") or "Home"
+            away = e.get("strAwayTeam") or "Away"
+            league = e.get("strLeague") or ""
+            codes = codes_by_league.get(league)
+            if codes is None:
+                codes = codes_by_league[league] = _league_codes(_norm_txt(league))
+            entries.append({
+                "id": str(e.get("idEvent") or "").strip(),
+                "ts": dt.timestamp(),
+                "league": league or "Soccer",
+                "line": f"{_format_kickoff_time(e)} — {home} vs {away}",
+                "codes": codes,
+                "scheduled": _is_scheduled(e),
+                "called_off": _is_called_off(e),  # postponed, cancelled...
+                "names": (_norm_txt(home), _norm_txt(away)),
+            })
+        entries.sort(key=lambda x: x["ts"])
+
+        self._entries = entries
+        self._ts = [x["ts"] for x in entries]
+
+        # prefix -> entry indices (ascending, i.e. kickoff order)
+        self._prefix = {}
+        for i, x in enumerate(entries):
+            keys = _prefix_keys(x["names"][0]) | _prefix_keys(x["names"][1])
+            for k in keys:
+                self._prefix.setdefault(k, []).append(i)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def between(self, start_ts: float, end_ts: float, selected_codes=None):
+        codes = set(selected_codes or DEFAULT_LEAGUES)
+        lo = bisect_left(self._ts, start_ts)
+        hi = bisect_right(self._ts, end_ts)
+        return [x for x in self._entries[lo:hi] if x["scheduled"] and x["codes"] & codes]
+
+    def upcoming(self, start_ts: float):
+        return self._entries[bisect_left(self._ts, start_ts):]
+
+    def team(self, query: str):
+        q = _norm_txt(query)
+        if len(q) < MIN_PREFIX:
+            return []
+
+        idxs = self._prefix.get(q)
+        if idxs is None and len(q) > MAX_PREFIX:
+            # Keys are capped at MAX_PREFIX; confirm the rest of the query by hand
+            idxs = [
+                i for i in self._prefix.get(q[:MAX_PREFIX], [])
+                if any(f" {q}" in f" {n}" for n in self._entries[i]["names"])
+            ]
+        return [self._entries[i] for i in (idxs or [])]
+
+
+_INDEX = None
+
+
+def _events_today_and_tomorrow(now: datetime):
+    events = fetch_events_today()
+    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        later = fetch_events_for_day(tomorrow)
+    except Exception:
+        # Today's fixtures are still worth serving without tomorrow's
+        return events
+
+    seen = {str(e.get("idEvent") or "").strip() for e in events}
+    return events + [e for e in later if str(e.get("idEvent") or "").strip() not in seen]
+
+
+def get_fixture_index() -> FixtureIndex:
+    """
+    Returns the today+tomorrow index, rebuilding it on a new UTC day or after the TTL.
+    """
+    global _INDEX
+    now = datetime.now(timezone.utc)
+    day = now.strftime("%Y-%m-%d")
+    stale = (
+        _INDEX is None
+        or _INDEX.day != day
+        or time.monotonic() - _INDEX.built_at > FIXTURE_INDEX_TTL_MIN * 60
+    )
+    if stale:
+        _INDEX = FixtureIndex(_events_today_and_tomorrow(now), day)
+    return _INDEX
+
+
+def _grouped(entries, max_games: int):
+    grouped = {}
+    for x in entries[:max_games]:
+        grouped.setdefault(x["league"], []).append(x["line"])
+    return grouped
+
+
+def build_team_message(index: FixtureIndex, query: str, max_games: int = 10) -> str:
+    if len(_norm_txt(query)) < MIN_PREFIX:
+        return f"Type at least {MIN_PREFIX} letters of the team name, e.g. team arsenal"
+
+    now_ts = datetime.now(timezone.utc).timestamp()
+    matches = [x for x in index.team(query) if not x["called_off"]]
+    upcoming = [x for x in matches if x["scheduled"] and x["ts"] >= now_ts]
+
+    if upcoming:
+        return _group("NEXT GAME", _grouped(upcoming, max_games))
+    if matches:
+        return _group("TODAY", _grouped(matches, max_games))
+    return f"No games today or tomorrow for {query}."
+
+
+def build_next_message(index: FixtureIndex, hours: float = 3, selected_codes=None, max_games: int = 30) -> str:
+    now_ts = datetime.now(timezone.utc).timestamp()
+    entries = index.between(now_ts, now_ts + hours * 3600, selected_codes)
+    header = f"NEXT {hours:g} HOURS"
+    return _group(header, _grouped(entries, max_games)) or f"No kickoffs in the next {hours:g} hours for your selected leagues."
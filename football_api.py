@@ -1,8 +1,9 @@
 # football_api.py
 import os
 import re
+import json
+import codecs
 import unicodedata
-import requests
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
@@ -156,13 +157,140 @@ def _norm_txt(s: str) -> str:
 
 
 def fetch_events_today():
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return fetch_events_for_day(datetime.now(timezone.utc).strftime("%Y-%m-%d"))
+
+
+def fetch_events_for_day(day: str):
     url = f"https://www.thesportsdb.com/api/v1/json/{SPORTSDB_KEY}/eventsday.php"
-    params = {"d": today, "s": "Soccer"}
+    params = {"d": day, "s": "Soccer"}
+
+    import requests  # lazy: keeps app import/cold start cheap
+
+    with requests.get(url, params=params, timeout=20, stream=True) as r:
+        r.raise_for_status()
+        events = list(_iter_events_stream(r.iter_content(chunk_size=FEED_CHUNK_SIZE)))
+    return events
+
+
+# Only the fields the bot actually reads; everything else in the feed
+# (thumbnails, video, venue, descriptions...) is dropped while parsing.
+EVENT_FIELDS = (
+    "idEvent",
+    "strLeague",
+    "strHomeTeam",
+    "strAwayTeam",
+    "intHomeScore",
+    "intAwayScore",
+    "strStatus",
+    "strTimestamp",
+    "dateEvent",
+    "strTime",
+)
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# "events": [ ... ] or, on a day without events, "events": null
+_EVENTS_START = re.compile(r'"events"\s*:\s*(\[|null)')
+
+
+def _project_event(e):
+    get = e.get
+    return {k: get(k) for k in EVENT_FIELDS}
+
+
+def _iter_events_stream(chunks):
+    """
+    Incrementally parses the "events" array of an eventsday.php response body.
+    Yields one projected record per event, so the full feed is never
+    materialized as Python objects.
+
+    Every complete event in the buffer is decoded with a single json.loads()
+    (cut at the last "},"), which keeps the work in the C decoder. If that cut
+    lands inside a string, the events up to it are decoded one at a time.
 
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    return (r.json() or {}).get("events") or []
+    Raises ValueError if the body ends inside the array or has no "events"
+    key at all; "events": null yields nothing.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    slow_until = 0
+    in_array = False
+
+    for chunk in chunks:
+        buf = buf[pos:] + utf8.decode(chunk)
+        slow_until = max(0, slow_until - pos)
+        pos = 0
+
+        if not in_array:
+            m = _EVENTS_START.search(buf)
+            if not m:
+                # Keep a tail in case the key is split across chunks
+                buf = buf[-32:]
+                continue
+            if m.group(1) == "null":
+                return
+            pos = m.end()
+            in_array = True
+
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                return
+
+            if pos >= slow_until:
+                cut = buf.rfind("},", pos)
+                if cut > pos:
+                    try:
+                        batch = json.loads("[" + buf[pos:cut + 1] + "]")
+                    except ValueError:
+                        slow_until = cut + 1
+                    else:
+                        for obj in batch:
+                            if isinstance(obj, dict):
+                                yield _project_event(obj)
+                        pos = cut + 1
+                        continue
+                elif buf.find("]", pos) == -1:
+                    break  # only a partial event left, wait for more data
+
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                break  # incomplete object, wait for more data
+            if isinstance(obj, dict):
+                yield _project_event(obj)
+
+    if in_array:
+        raise ValueError("Truncated events feed")
+    # An error page or changed format must not pass for a day without events
+    raise ValueError("No events array in feed")
+
+
+_LEAGUE_KEYWORDS_NORM = None
+
+
+def _league_keywords_norm():
+    """
+    LEAGUE_MAP with keywords already normalized (built once).
+    """
+    global _LEAGUE_KEYWORDS_NORM
+    if _LEAGUE_KEYWORDS_NORM is None:
+        _LEAGUE_KEYWORDS_NORM = {
+            code: tuple(_norm_txt(kw) for kw in kws) for code, kws in LEAGUE_MAP.items()
+        }
+    return _LEAGUE_KEYWORDS_NORM
+
+
+def warm_up():
+    """
+    Precomputes lookup tables so the first request doesn't pay for them.
+    """
+    _league_keywords_norm()
 
 
 def _match_selected_leagues(event, selected_codes):
@@ -173,9 +301,10 @@ def _match_selected_leagues(event, selected_codes):
     if not league_text:
         return False
 
+    keywords = _league_keywords_norm()
     for code in selected_codes:
-        for kw in LEAGUE_MAP.get(code, []):
-            if _norm_txt(kw) in league_text:
+        for kw in keywords.get(code, ()):
+            if kw in league_text:
                 return True
     return False
 
@@ -0,0 +1,116 @@
+# rate_limit.py
+"""
+Per-phone token bucket for inbound commands.
+
+Each phone gets RATE_LIMIT_CAPACITY tokens, refilled at RATE_LIMIT_REFILL_PER_MIN.
+Commands that hit the upstream feed cost more than cheap ones.
+
+State is in memory, bounded to RATE_LIMIT_MAX_PHONES (least recently seen dropped first).
+A bucket idle long enough to be full again carries no information, so dropping it is free.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "10"))
+RATE_LIMIT_REFILL_PER_MIN = float(os.getenv("RATE_LIMIT_REFILL_PER_MIN", "6"))
+RATE_LIMIT_MAX_PHONES = int(os.getenv("RATE_LIMIT_MAX_PHONES", "10000"))
+
+DEFAULT_COST = 1.0
+
+# Commands that trigger an upstream fetch are the expensive ones.
+# Keys match the full text or, for commands with arguments, the first word.
+COMMAND_COSTS = {
+    "live": 3.0,
+    "scores": 3.0,
+    "fixtures": 3.0,
+    "today": 3.0,
+    "results": 3.0,
+    "debug leagues": 5.0,
+    # May rebuild the fixture index (full fetch) when it is stale
+    "team": 3.0,
+    "next": 3.0,
+}
+
+
+def _parse_costs(raw: str):
+    """
+    "live=2,debug leagues=8" -> {"live": 2.0, "debug leagues": 8.0}
+    """
+    out = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        cmd, cost = part.split("=", 1)
+        try:
+            out[cmd.strip().lower()] = float(cost)
+        except ValueError:
+            continue
+    return out
+
+
+COMMAND_COSTS.update(_parse_costs(os.getenv("RATE_LIMIT_COSTS", "")))
+
+
+def command_cost(text: str) -> float:
+    text = (text or "").strip().lower()
+    cost = COMMAND_COSTS.get(text)
+    if cost is None:
+        cost = COMMAND_COSTS.get(text.split(" ", 1)[0], DEFAULT_COST)
+    return cost
+
+
+class RateLimiter:
+    def __init__(self, capacity: float, refill_per_min: float, max_phones: int):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_min / 60.0
+        self.max_phones = max_phones
+        # phone -> [tokens, last_ts, notified]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _idle_full_secs(self) -> float:
+        if self.refill_per_sec <= 0:
+            return float("inf")
+        return self.capacity / self.refill_per_sec
+
+    def allow(self, phone: str, cost: float = DEFAULT_COST, now: float = None):
+        """
+        Returns (allowed, notify). `notify` is True only for the first rejection
+        in a streak, so a spammer gets one "slow down" reply instead of one per message.
+        """
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            bucket = self._buckets.get(phone)
+            if bucket is None:
+                bucket = [self.capacity, now, False]
+                self._buckets[phone] = bucket
+                self._evict(now)
+            else:
+                self._buckets.move_to_end(phone)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_sec)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                bucket[2] = False
+                return True, False
+
+            notify = not bucket[2]
+            bucket[2] = True
+            return False, notify
+
+    def _evict(self, now: float) -> None:
+        # Oldest first: drop anything idle long enough to be full again, then enforce the cap
+        idle_full = self._idle_full_secs()
+        while self._buckets:
+            phone, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] >= idle_full or len(self._buckets) > self.max_phones:
+                self._buckets.popitem(last=False)
+            else:
+                break
+
+
+limiter = RateLimiter(RATE_LIMIT_CAPACITY, RATE_LIMIT_REFILL_PER_MIN, RATE_LIMIT_MAX_PHONES)
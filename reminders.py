@@ -0,0 +1,156 @@
+# reminders.py
+"""
+Pre-kickoff reminders ("remind on").
+
+Upcoming kickoffs from the fixture index go into a heap keyed by fire time
+(kickoff - REMINDER_LEAD_MIN). One timer is armed for the earliest entry, so
+nothing runs between reminders and there is no per-tick scan of events/users.
+When it fires, the due matches fan out to users subscribed to that league.
+
+The fixture index covers tomorrow's feed too, so kickoffs just after
+00:00 UTC are queued before their reminder time has passed.
+"""
+import os
+import time
+import heapq
+import threading
+from datetime import datetime, timezone
+
+from database import SessionLocal, User
+from whatsapp import send_message
+from fixture_index import get_fixture_index
+from scheduler import _parse_user_leagues
+
+REMINDER_LEAD_MIN = int(os.getenv("REMINDER_LEAD_MIN", "15"))
+
+# If subscribers can't be loaded (DB busy/down), due reminders are retried this much later
+REMINDER_RETRY_SECS = int(os.getenv("REMINDER_RETRY_SECS", "30"))
+
+# Fired/scheduled ids are forgotten this long after kickoff
+_FORGET_AFTER_SECS = 24 * 3600
+
+
+class ReminderQueue:
+    def __init__(self, lead_min: int = REMINDER_LEAD_MIN, send=send_message):
+        self.lead_secs = lead_min * 60
+        self.lead_min = lead_min
+        self._send = send
+        self._heap = []        # (fire_ts, event_id, kickoff_ts, entry)
+        self._scheduled = {}   # event_id -> kickoff_ts of the live heap entry
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def schedule(self, entries, now_ts: float = None) -> int:
+        """
+        Adds fixture-index entries that haven't kicked off yet. If the reminder
+        time has already passed (late refresh), it fires right away.
+        Re-adding an event with a moved kickoff supersedes the old entry;
+        one that is no longer scheduled (postponed, cancelled...) is dropped.
+        """
+        now_ts = time.time() if now_ts is None else now_ts
+        added = 0
+
+        with self._lock:
+            for eid in [k for k, ts in self._scheduled.items() if ts < now_ts - _FORGET_AFTER_SECS]:
+                del self._scheduled[eid]
+
+            for x in entries:
+                eid = x.get("id")
+                if not eid or not x["codes"]:
+                    continue
+                kickoff_ts = x["ts"]
+                if not x["scheduled"]:
+                    # Popping the id makes any queued heap entry stale
+                    if kickoff_ts > now_ts:
+                        self._scheduled.pop(eid, None)
+                    continue
+                if kickoff_ts <= now_ts or self._scheduled.get(eid) == kickoff_ts:
+                    continue
+                fire_ts = max(kickoff_ts - self.lead_secs, now_ts)
+                self._scheduled[eid] = kickoff_ts
+                heapq.heappush(self._heap, (fire_ts, eid, kickoff_ts, x))
+                added += 1
+
+            self._arm()
+        return added
+
+    def _arm(self) -> None:
+        # Caller holds the lock
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._heap:
+            return
+        delay = max(0.0, self._heap[0][0] - time.time())
+        self._timer = threading.Timer(delay, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _pop_due(self, now_ts: float):
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now_ts:
+                _, eid, kickoff_ts, x = heapq.heappop(self._heap)
+                if self._scheduled.get(eid) == kickoff_ts:  # skip superseded/cancelled entries
+                    due.append(x)
+        return due
+
+    def _fire(self) -> None:
+        try:
+            due = self._pop_due(time.time())
+            if due:
+                self._deliver(due)
+        finally:
+            with self._lock:
+                self._arm()
+
+    def _requeue(self, due, retry_ts: float) -> None:
+        # Entries were already popped; put back the ones still worth sending
+        with self._lock:
+            for x in due:
+                eid, kickoff_ts = x["id"], x["ts"]
+                if self._scheduled.get(eid) == kickoff_ts and kickoff_ts > retry_ts:
+                    heapq.heappush(self._heap, (retry_ts, eid, kickoff_ts, x))
+
+    def _deliver(self, due) -> None:
+        db = SessionLocal()
+        try:
+            users = db.query(User).filter(User.reminders == True).all()
+            subscribers = [(u.phone, set(_parse_user_leagues(u.leagues))) for u in users]
+        except Exception:
+            self._requeue(due, time.time() + REMINDER_RETRY_SECS)
+            return
+        finally:
+            db.close()
+
+        now_ts = time.time()
+        for x in due:
+            mins = max(1, min(self.lead_min, round((x["ts"] - now_ts) / 60)))
+            text = f"KICKOFF IN {mins} MIN\n{x['line']}"
+            for phone, codes in subscribers:
+                if codes & x["codes"]:
+                    try:
+                        self._send(phone, text)
+                    except Exception:
+                        # One bad send must not cost everyone else their reminder
+                        continue
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+
+queue = ReminderQueue()
+
+
+def refresh_reminders():
+    """
+    Loads upcoming kickoffs into the queue (run periodically by the scheduler).
+    """
+    now_ts = datetime.now(timezone.utc).timestamp()
+    try:
+        queue.schedule(get_fixture_index().upcoming(now_ts), now_ts)
+    except Exception:
+        pass
@@ -1,11 +1,20 @@
 # scheduler.py
 import os
-from datetime import datetime, timedelta
-
-from apscheduler.schedulers.background import BackgroundScheduler
-
-from database import SessionLocal, User, MatchState
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+from database import (
+    SessionLocal,
+    User,
+    MatchState,
+    PHASE_OTHER,
+    PHASE_LIVE,
+    PHASE_FINISHED,
+)
 from whatsapp import send_message
+from feed_recorder import RECORD_DIR, FEED_RECORD_INTERVAL_SEC, record_feed
 from football_api import (
     fetch_events_today,
     DEFAULT_LEAGUES,
@@ -20,6 +29,19 @@ from football_api import (
 # ✅ Prevent multiple scheduler instances unless you explicitly enable it
 ENABLE_SCHEDULER = os.getenv("ENABLE_SCHEDULER", "1") == "1"
 
+# With several preforked workers only the one holding this lock runs the scheduler
+SCHEDULER_LOCK_FILE = os.getenv("SCHEDULER_LOCK_FILE", "./scheduler.lock")
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, rely on ENABLE_SCHEDULER
+    fcntl = None
+
+_lock_handle = None
+
+MATCH_STATE_RETENTION_DAYS = int(os.getenv("MATCH_STATE_RETENTION_DAYS", "2"))
+CLEANUP_BATCH_SIZE = 5000
+
 
 def _parse_user_leagues(leagues_str: str):
     if not leagues_str:
@@ -38,8 +60,12 @@ def _safe_int(v):
         return None
 
 
-def _state_key(phone: str, event_id: str) -> str:
-    return f"{phone}:{event_id}"
+def _phase(is_live_now: bool, is_finished_now: bool) -> int:
+    if is_finished_now:
+        return PHASE_FINISHED
+    if is_live_now:
+        return PHASE_LIVE
+    return PHASE_OTHER
 
 
 def send_auto_updates():
@@ -58,21 +84,25 @@ def send_auto_updates():
         if not events:
             return
 
-        # Optional cleanup of old match states (keeps DB small)
-        cutoff = datetime.utcnow() - timedelta(days=2)
-        db.query(MatchState).filter(MatchState.updated_at < cutoff).delete()
-        db.commit()
+        now_ts = int(time.time())
+
+        # Plain values: a rollback below would otherwise expire the User objects
+        subscribers = [(u.phone, u.leagues) for u in users]
 
-        for user in users:
-            phone = user.phone
-            selected_codes = _parse_user_leagues(user.leagues)
+        for phone, leagues in subscribers:
+            selected_codes = _parse_user_leagues(leagues)
 
             # Filter events for this user's leagues
             filtered = [e for e in events if _match_selected_leagues(e, selected_codes)]
+            if not filtered:
+                continue
+
+            # One PK range scan instead of a lookup per event
+            states = {s.event_id: s for s in db.query(MatchState).filter(MatchState.phone == phone)}
 
             for e in filtered:
-                event_id = str(e.get("idEvent") or "").strip()
-                if not event_id:
+                event_id = _safe_int(e.get("idEvent"))
+                if event_id is None:
                     continue
 
                 is_live_now = _is_live(e)
@@ -82,31 +112,24 @@ def send_auto_updates():
                 if not is_live_now and not is_finished_now:
                     continue
 
-                home = e.get("strHomeTeam") or "Home"
-                away = e.get("strAwayTeam") or "Away"
-                status = (e.get("strStatus") or "").strip()
-
                 hs = _safe_int(e.get("intHomeScore"))
                 a_s = _safe_int(e.get("intAwayScore"))
+                phase = _phase(is_live_now, is_finished_now)
 
-                key = _state_key(phone, event_id)
-                state = db.get(MatchState, key)
+                state = states.get(event_id)
 
                 # First time we see the match for this user
                 if not state:
-                    state = MatchState(
-                        key=key,
+                    # Track it right away so a repeated idEvent in this feed isn't added twice
+                    states[event_id] = MatchState(
                         phone=phone,
                         event_id=event_id,
-                        home=home,
-                        away=away,
                         home_score=hs,
                         away_score=a_s,
-                        status=status,
-                        updated_at=datetime.utcnow(),
+                        phase=phase,
+                        updated_at=now_ts,
                     )
-                    db.add(state)
-                    db.commit()
+                    db.add(states[event_id])
 
                     # Kickoff alert if it's live
                     if is_live_now:
@@ -116,19 +139,13 @@ def send_auto_updates():
                     continue
 
                 # Existing state: detect changes
-                prev_hs = state.home_score
-                prev_as = state.away_score
-                prev_status = (state.status or "").strip()
-
-                # Goal/change detection (score changed while live)
-                score_changed = (hs is not None and a_s is not None) and (hs != prev_hs or a_s != prev_as)
+                score_changed = (hs is not None and a_s is not None) and (hs != state.home_score or a_s != state.away_score)
 
                 # Finished transition
-                finished_now = is_finished_now and not any(k in prev_status.lower() for k in ("finished", "ft", "full time", "final", "ended"))
+                finished_now = phase == PHASE_FINISHED and state.phase != PHASE_FINISHED
 
                 # Kickoff transition (was not live before, now live)
-                was_live_before = "live" in (prev_status.lower())
-                kickoff_now = is_live_now and not was_live_before and not is_finished_now
+                kickoff_now = phase == PHASE_LIVE and state.phase != PHASE_LIVE
 
                 # Send alerts in priority order
                 if finished_now:
@@ -142,26 +159,97 @@ def send_auto_updates():
                 elif kickoff_now:
                     send_message(phone, "KICKOFF\n" + _fmt_live_line(e))
 
-                # Update stored state
-                state.home = home
-                state.away = away
-                state.home_score = hs
-                state.away_score = a_s
-                state.status = status
-                state.updated_at = datetime.utcnow()
+                # Only write rows that actually changed
+                if score_changed or phase != state.phase:
+                    state.home_score = hs
+                    state.away_score = a_s
+                    state.phase = phase
+                    state.updated_at = now_ts
+
+            # One commit per user rather than per event; a bad user mustn't stop the tick
+            try:
                 db.commit()
+            except Exception:
+                db.rollback()
 
     finally:
         db.close()
 
 
+def cleanup_match_state(retention_days: int = MATCH_STATE_RETENTION_DAYS, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    """
+    Deletes match states not touched for `retention_days`, in batches so each
+    write transaction stays short. There is no index on updated_at, so every
+    batch scans the table; fine for a job that runs daily, not on every tick.
+    """
+    cutoff = int(time.time()) - retention_days * 86400
+    deleted = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            result = db.execute(
+                text(
+                    "DELETE FROM match_state WHERE (phone, event_id) IN ("
+                    "SELECT phone, event_id FROM match_state WHERE updated_at < :cutoff LIMIT :n)"
+                ),
+                {"cutoff": cutoff, "n": batch_size},
+            )
+            db.commit()
+            deleted += result.rowcount or 0
+            if (result.rowcount or 0) < batch_size:
+                break
+    finally:
+        db.close()
+
+    return deleted
+
+
+def _acquire_scheduler_lock() -> bool:
+    global _lock_handle
+    if fcntl is None:
+        return True
+    if _lock_handle is not None:
+        return True
+    try:
+        handle = open(SCHEDULER_LOCK_FILE, "w")
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    _lock_handle = handle  # keep open: closing releases the lock
+    return True
+
+
 def start_scheduler():
+    """
+    Starts the background job. Returns None if another worker already owns it.
+    """
+    if not _acquire_scheduler_lock():
+        return None
+
+    # Imported here so plain `import scheduler` stays cheap
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    from reminders import refresh_reminders
+
     sched = BackgroundScheduler()
     # 2 minutes is a good "FlashScore feel" without hammering the API too hard
     sched.add_job(send_auto_updates, "interval", minutes=2, max_instances=1, coalesce=True)
+    # Retention cleanup is batched and infrequent, off the alert path. Also run at
+    # startup: instances are often redeployed well before 24h of uptime.
+    sched.add_job(
+        cleanup_match_state, "interval", hours=24, max_instances=1, coalesce=True,
+        next_run_time=datetime.now(),
+    )
+    # Matchday capture for offline replays (feed_recorder.py), off unless FEED_RECORD_DIR is set
+    if RECORD_DIR:
+        sched.add_job(
+            record_feed, "interval", seconds=FEED_RECORD_INTERVAL_SEC, max_instances=1, coalesce=True,
+        )
+    # Reminders fire from their own timer; this only tops up the queue with new kickoffs
+    sched.add_job(
+        refresh_reminders, "interval", minutes=30, max_instances=1, coalesce=True,
+        next_run_time=datetime.now(),
+    )
     sched.start()
     return sched
-
-
-if ENABLE_SCHEDULER:
-    start_scheduler()
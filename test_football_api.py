@@ -0,0 +1,106 @@
+# test_football_api.py
+"""
+Streaming events-feed parser vs. a plain json.loads() of the same body.
+
+    python -m pytest -q
+"""
+import json
+import random
+
+import pytest
+
+from football_api import EVENT_FIELDS, _iter_events_stream, _project_event
+
+
+def _event(i, **extra):
+    e = {
+        "idEvent": str(1000 + i),
+        "strLeague": "English Premier League",
+        "strHomeTeam": f"Home {i}",
+        "strAwayTeam": f"Away {i}",
+        "intHomeScore": str(i % 4),
+        "intAwayScore": None,
+        "strStatus": "Not Started",
+        "strTimestamp": "2026-10-18T15:00:00",
+        "dateEvent": "2026-10-18",
+        "strTime": "15:00:00",
+        "strDescriptionEN": "Preview " * (i % 7),
+    }
+    e.update(extra)
+    return e
+
+
+def _tricky_events():
+    return [
+        _event(0),
+        # Looks like an object boundary inside a string
+        _event(1, strDescriptionEN='ends with }, then {"idEvent": "x"}, more'),
+        _event(2, strHomeTeam='Club "A" \\ }, B', strDescriptionEN="}]},{"),
+        # Nested objects and arrays in fields we don't keep
+        _event(3, strMeta={"a": [1, {"b": "},"}], "c": {"d": []}}, strTags=["x", "},", {"y": None}]),
+        # Multi-byte characters, which can be split across chunks
+        _event(4, strHomeTeam="Atlético Madrid", strAwayTeam="Bayern München ⚽"),
+        {"idEvent": "1005"},  # missing fields -> None
+    ] + [_event(i) for i in range(6, 200)]
+
+
+def _expected(body: bytes):
+    return [_project_event(e) for e in (json.loads(body) or {}).get("events") or []]
+
+
+def _chunked(body: bytes, sizes):
+    i = 0
+    for n in sizes:
+        if i >= len(body):
+            return
+        yield body[i:i + n]
+        i += n
+    if i < len(body):
+        yield body[i:]
+
+
+def _parse(body: bytes, sizes=(64 * 1024,) * 1000):
+    return list(_iter_events_stream(_chunked(body, sizes)))
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_sizes_match_json_loads(seed, indent):
+    body = json.dumps({"events": _tricky_events()}, indent=indent, ensure_ascii=False).encode("utf-8")
+    rnd = random.Random(seed)
+    sizes = [rnd.choice((1, 2, 3, 7, 64, 500, 4096)) for _ in range(len(body))]
+    assert _parse(body, sizes) == _expected(body)
+
+
+def test_single_chunk_matches_json_loads():
+    body = json.dumps({"events": _tricky_events()}).encode("utf-8")
+    got = _parse(body, [len(body)])
+    assert got == _expected(body)
+    assert all(tuple(e) == EVENT_FIELDS for e in got)
+
+
+def test_other_keys_before_events():
+    body = json.dumps({"meta": {"events": "no"}, "events": [_event(0)]}).encode("utf-8")
+    assert _parse(body, [3] * len(body)) == _expected(body)
+
+
+@pytest.mark.parametrize("body", [b'{"events":null}', b'{"events": null}\n', b'{"events":[]}', b'{ "events" : [ ] }'])
+def test_no_events(body):
+    assert _parse(body, [1] * len(body)) == []
+
+
+@pytest.mark.parametrize("body", [b"", b"{}", b'{"error":"rate limited"}', b"<html><body>502 Bad Gateway</body></html>"])
+def test_missing_events_array_raises(body):
+    with pytest.raises(ValueError):
+        _parse(body)
+
+
+def test_truncated_body_raises():
+    body = json.dumps({"events": _tricky_events()}).encode("utf-8")
+    start = body.index(b"[") + 1
+    rnd = random.Random(0)
+    # Cut anywhere inside the array, including right after a complete event
+    cuts = rnd.sample(range(start, len(body) - 1), 50) + [body.index(b"},") + 2]
+    for cut in cuts:
+        with pytest.raises(ValueError):
+            _parse(body[:cut], [rnd.choice((1, 17, 4096))] * cut)
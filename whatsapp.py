@@ -1,5 +1,4 @@
 import os
-import requests
 
 ACCESS_TOKEN = os.getenv("ACCESS_TOKEN", "EAA83CwyZBN9QBQxXNY6IoyeqTZCeuYqjZB96kdkbLLoWBpGdPZCnLY3HOqSLMLVJMgdeFBVUGnScfEwqUsGKxrhLqtkrPrE3tFu6fYAPn2XVGAXpNEWihnZAP45y5uQwBPZAAS2ZAVGyGtJmQNyzJtE1npePhbMZBdkJ77gt4ZBKrHe7eoQEvRhjFAg0Ob4gZB2blu4fwdFZATtRdEitK0ehPkVlmVAmA1SUt210Hljs544")
 PHONE_ID = os.getenv("PHONE_ID", "1049528254903132")
@@ -30,6 +29,8 @@ def send_message(to_phone: str, text: str) -> None:
         "text": {"body": text},
     }
 
+    import requests  # lazy: keeps app import/cold start cheap
+
     try:
         requests.post(url, headers=headers, json=payload, timeout=15)
     except Exception: